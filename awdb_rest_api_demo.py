@@ -3,30 +3,136 @@
 Created by Beau Uriona - beau.uriona@usda.gov
 """
 
-import datetime
 import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from functools import cache
+from pathlib import Path
 
 import folium
+import numpy as np
+import orjson
 import pandas as pd
-import requests
+import requests_cache
 from altair import Axis, Chart, Column, X
+from requests.adapters import HTTPAdapter
 
 DOMAIN = "https://wcc.sc.egov.usda.gov"
 BASE_URL = f"{DOMAIN}/awdbRestApi/services/v1"
+TIMEOUT = 30
+CACHE_DIR = Path("./.cache")
+
+# request status is logged at DEBUG, enable it with
+# logging.basicConfig(level=logging.DEBUG) to see every url requested
+log = logging.getLogger(__name__)
+
+# the current water year runs from Oct 1st through today, computed once rather
+# than for every station request
+TODAY = date.today()
+WY_START = date(TODAY.year - (0 if TODAY.month > 9 else 1), 10, 1)
+TODAY_STR = f"{TODAY:%Y-%m-%d}"
+WY_START_STR = f"{WY_START:%Y-%m-%d}"
+
+# share a single session across all requests so connections to the AWDB host
+# are pooled and reused rather than re-negotiated on every call. Responses are
+# cached to disk so re-running the analysis only hits the network for expired
+# data, station/reference data changes rarely so it can be kept much longer
+SESSION = requests_cache.CachedSession(
+    "awdb_cache",
+    backend="sqlite",
+    expire_after=3600,
+    urls_expire_after={
+        "*/services/v1/reference-data*": 86400,
+        "*/services/v1/stations*": 86400,
+        "*/services/v1/data*": 3600,
+        "*/services/v1/forecasts*": 3600,
+    },
+)
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+# explicitly ask for gzip, the json responses are mostly whitespace and
+# compress very well
+SESSION.headers.update({"Accept-Encoding": "gzip", "Connection": "keep-alive"})
+
+
+@cache
+def _log_content_encoding(encoding):
+    """logs each distinct response Content-Encoding only once, to confirm the
+    server is honoring our gzip request
+    """
+
+    log.debug("Content-Encoding: %s", encoding)
+
+
+def _get_json(url):
+    """returns the decoded json body of a GET request to url, or None if the
+    request failed
+    """
+
+    req = SESSION.get(url, timeout=TIMEOUT)
+    log.debug("%s - %s", "OK" if req.ok else "FAIL", url)
+    _log_content_encoding(req.headers.get("Content-Encoding"))
+    if req.ok:
+        return orjson.loads(req.content)
+    return None
 
 
-def get_ref_data(table="all", base_url=BASE_URL):
+def get_cached_geojson(url, cache_path, fallback_path=None, max_age=86400):
+    """returns geojson from a local cache file if it is less than max_age
+    seconds old, otherwise streams it from url into the cache file first. A
+    stale cache file is revalidated using its etag so an unchanged file is not
+    downloaded again. If the download fails and there is no cached copy the
+    geojson is read from fallback_path, or the request error is raised
+    """
+
+    cache_path = Path(cache_path)
+    etag_path = cache_path.with_suffix(".etag")
+    if cache_path.exists() and time.time() - cache_path.stat().st_mtime < max_age:
+        return orjson.loads(cache_path.read_bytes())
+
+    headers = {}
+    if cache_path.exists() and etag_path.exists():
+        headers["If-None-Match"] = etag_path.read_text()
+    # bypass the sqlite response cache, this file is cached on its own and the
+    # response cache would both buffer the stream and swallow any 304
+    with SESSION.cache_disabled(), SESSION.get(
+        url, headers=headers, stream=True, timeout=TIMEOUT
+    ) as req:
+        log.debug("%s - %s", "OK" if req.ok else "FAIL", url)
+        if req.status_code == 304:
+            cache_path.touch()
+        elif req.ok:
+            # write to a temp file first so an interrupted download never
+            # leaves a truncated cache file behind
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            with tmp_path.open("wb") as f:
+                for chunk in req.iter_content(chunk_size=65536):
+                    f.write(chunk)
+            tmp_path.replace(cache_path)
+            if "ETag" in req.headers:
+                etag_path.write_text(req.headers["ETag"])
+            else:
+                etag_path.unlink(missing_ok=True)
+        elif not cache_path.exists():
+            if fallback_path is None:
+                req.raise_for_status()
+            return orjson.loads(Path(fallback_path).read_bytes())
+    return orjson.loads(cache_path.read_bytes())
+
+
+def get_ref_data(table="networks", base_url=BASE_URL):
     """returns reference data tables, useful for converting codes to full
-    names and descriptions
+    names and descriptions. Defaults to only the networks table, pass
+    table="all" for the entire (much larger) catalog
     """
 
     endpoint = "reference-data"
     url = f"{base_url}/{endpoint}?referenceLists={table}"
-    req = requests.get(url)
-    print(f"{'Sucess!' if req.ok else 'Failed!'} - {url}")
-    if req.ok:
-        return req.json()
+    data = _get_json(url)
+    if data is not None:
+        return data
     return {}
 
 
@@ -41,21 +147,22 @@ def get_stations(networks="*", huc_filter="*", active_only=True, base_url=BASE_U
     if not active_only:
         args = f"{args}&activeOnly=false"
     url = f"{base_url}/{endpoint}?{args}"
-    req = requests.get(url)
-    print(f"{'Sucess!' if req.ok else 'Failed!'} - {url}")
-    if req.ok:
-        results = req.json()
+    results = _get_json(url)
+    if results is not None:
         if huc_filter != "*":
-            results[:] = [
-                i for i in results if i.get("huc", "NA").startswith(str(huc_filter))
-            ]
+            hucs = np.fromiter(
+                (i.get("huc", "NA") for i in results), dtype=object, count=len(results)
+            )
+            mask = pd.Series(hucs).str.startswith(str(huc_filter), na=False)
+            results[:] = [results[i] for i in np.flatnonzero(mask.to_numpy())]
         return results
     return []
 
 
 def get_metadata(triplets, elements="*", durations="DAILY", base_url=BASE_URL):
     """returns all metadata associated with stations based on a list of
-    triplets. Filter station elements based on elementCode and Duration
+    triplets. Filter station elements based on elementCode and Duration.
+    Returns None if the request fails
     """
 
     endpoint = "stations"
@@ -65,11 +172,25 @@ def get_metadata(triplets, elements="*", durations="DAILY", base_url=BASE_URL):
     )
     args = f"{triplet_arg}&{element_arg}&returnForecastPointMetadata=true&returnReservoirMetadata=true&activeOnly=false"
     url = f"{base_url}/{endpoint}?{args}"
-    req = requests.get(url)
-    print(f"{'Sucess!' if req.ok else 'Failed!'} - {url}")
-    if req.ok:
-        return req.json()
-    return {}
+    return _get_json(url)
+
+
+def filter_metadata(metadata, element_code, duration):
+    """returns only the stations from a list of metadata that have a station
+    element matching elementCode and duration, with their stationElements
+    limited to the matches
+    """
+
+    results = []
+    for station in metadata:
+        elements = [
+            i
+            for i in station.get("stationElements", [])
+            if i["elementCode"] == element_code and i["durationName"] == duration
+        ]
+        if elements:
+            results.append({**station, "stationElements": elements})
+    return results
 
 
 def get_wy_data(triplet, duration="DAILY", element="WTEQ", base_url=BASE_URL):
@@ -80,18 +201,13 @@ def get_wy_data(triplet, duration="DAILY", element="WTEQ", base_url=BASE_URL):
     endpoint = "data"
     triplet_arg = f"stationTriplets={triplet}"
     element_arg = f"elements={element}&duration={duration}"
-    today = date.today()
-    wy_start_date = date(today.year - 1, 10, 1)
-    if today.month > 9:
-        wy_start_date = date(today.year, 10, 1)
-    date_args = f"beginDate={wy_start_date:%Y-%m-%d}&endDate={today:%Y-%m-%d}"
+    date_args = f"beginDate={WY_START_STR}&endDate={TODAY_STR}"
     misc_args = "periodRef=START&centralTendencyType=MEDIAN"
     args = f"{triplet_arg}&{element_arg}&{date_args}&{misc_args}"
     url = f"{base_url}/{endpoint}?{args}"
-    req = requests.get(url)
-    print(f"{'Sucess!' if req.ok else 'Failed!'} - {url}")
-    if req.ok:
-        return req.json()[0]
+    data = _get_json(url)
+    if data:
+        return data[0]
     return {}
 
 
@@ -109,9 +225,7 @@ def get_stations_wy_data(station):
     df = pd.DataFrame(data.get("data", [{}])[0].get("values", []))
     data_label = f"{element_code} ({units})".replace("_", "-")
     if "date" not in df.columns:
-        df["date"] = df[["year", "month"]].apply(
-            lambda s: datetime.datetime(*s, 1), axis=1
-        )
+        df["date"] = pd.to_datetime(dict(year=df["year"], month=df["month"], day=1))
         # df.drop(columns=("year", "month"), inplace=True)
     df = df.melt(
         id_vars="date",
@@ -131,17 +245,14 @@ def get_wy_forecasts(triplet, base_url=BASE_URL):
     endpoint = "forecasts"
     triplet_arg = f"stationTriplets={triplet}"
     element_arg = "elementCodes=SRVO"
-    today = date.today()
-    wy_start_date = date(today.year - 1, 10, 1)
-    if today.month > 9:
-        wy_start_date = date(today.year, 10, 1)
-    date_args = f"beginPublicationDate={wy_start_date:%Y-%m-%d}&endPublicationDate={today:%Y-%m-%d}"
+    date_args = (
+        f"beginPublicationDate={WY_START_STR}&endPublicationDate={TODAY_STR}"
+    )
     args = f"{triplet_arg}&{element_arg}&{date_args}"
     url = f"{base_url}/{endpoint}?{args}"
-    req = requests.get(url)
-    print(f"{'Sucess!' if req.ok else 'Failed!'} - {url}")
-    if req.ok:
-        return req.json()[0]
+    data = _get_json(url)
+    if data:
+        return data[0]
     return {}
 
 
@@ -154,20 +265,23 @@ def prepare_wy_forecasts(station, period=("04-01", "07-31")):
     forecasts = get_wy_forecasts(triplet).get("data", [])
     if not forecasts:
         return pd.DataFrame()
-    forecasts = [
-        {"date": i["publicationDate"], **i["forecastValues"]}
-        for i in forecasts
-        if i["forecastPeriod"][0] == period[0] and i["forecastPeriod"][1] == period[1]
-    ]
 
-    df = pd.DataFrame(forecasts)
+    # filter on the forecast period before flattening, so only exceedances
+    # present in the desired period become columns
+    periods = pd.Series([i["forecastPeriod"] for i in forecasts], dtype=object)
+    mask = (periods.str[0] == period[0]) & (periods.str[1] == period[1])
+    if not mask.any():
+        return pd.DataFrame()
+    df = pd.json_normalize([forecasts[i] for i in np.flatnonzero(mask.to_numpy())])
+    df = df.rename(columns={"publicationDate": "date"})
+    df.columns = df.columns.str.removeprefix("forecastValues.")
     df = df.melt(
         id_vars="date",
         var_name="Exceedance",
         value_name="APR-JUL SRVO (kaf)",
         value_vars=(i for i in df.columns if i.isnumeric()),
     )
-    df["Exceedance"] = df["Exceedance"].apply(lambda x: f"{x}%")
+    df["Exceedance"] = df["Exceedance"].astype(str) + "%"
     return df
 
 
@@ -181,30 +295,44 @@ stations = get_stations(
     huc_filter="14010004",
 )
 
-# prepare a list of only the triplets to be fed to metadata method
-triplets = [i["stationTriplet"] for i in stations]
+# prepare a comma separated string of only the triplets to be fed to metadata method
+triplets_csv = ",".join(i["stationTriplet"] for i in stations)
 
-# get a list of snotels and the daily snow water equivalent (WTEQ) elements in our desired HUC
-met_metadata = get_metadata(
-    triplets=",".join(triplets),
-    elements="WTEQ",
-    durations="DAILY",
+# get the metadata for all of the elements we care about in a single request
+metadata = get_metadata(
+    triplets=triplets_csv,
+    elements="WTEQ,RESC,SRVO",
+    durations="DAILY,MONTHLY",
 )
+if metadata is None:
+    # fall back to one request per duration if the combined request fails
+    metadata = (
+        get_metadata(
+            triplets=triplets_csv,
+            elements="WTEQ",
+            durations="DAILY",
+        )
+        or []
+    ) + (
+        get_metadata(
+            triplets=triplets_csv,
+            elements="RESC,SRVO",
+            durations="MONTHLY",
+        )
+        or []
+    )
+
+# get a list of snotels and the daily snow water equivalent (WTEQ) elements in our desired HUC
+met_metadata = filter_metadata(metadata, "WTEQ", "DAILY")
 # get a list of reservoirs and the monthly reservoir storage (RESC) elements in our desired HUC
-reservoir_metadata = get_metadata(
-    triplets=",".join(triplets),
-    elements="RESC",
-    durations="MONTHLY",
-)
+reservoir_metadata = filter_metadata(metadata, "RESC", "MONTHLY")
 # get a list of streamflow/forecasts and the monthly adjusted streamflow (SRVO) elements in our desired HUC
-gage_metadata = get_metadata(
-    triplets=",".join(triplets),
-    elements="SRVO",
-    durations="MONTHLY",
-)
+gage_metadata = filter_metadata(metadata, "SRVO", "MONTHLY")
 
 # filter out only our desired "pour point" forecast in the Roaring Fork HUC
-gage_metadata = [i for i in gage_metadata if "roaring" in i["name"].lower()]
+gage_names = pd.Series([i["name"] for i in gage_metadata], dtype=object)
+roaring_mask = gage_names.str.contains("roaring", case=False, regex=False, na=False)
+gage_metadata = [gage_metadata[i] for i in np.flatnonzero(roaring_mask.to_numpy())]
 
 # combine the metadata lists into all the stations we care about in this analysis
 all_metadata = met_metadata + reservoir_metadata + gage_metadata
@@ -224,137 +352,153 @@ def get_marker_icon(station):
     return folium.Icon(prefix="fa", icon=icon, color=color)
 
 
-def get_daily_snotel_data_chart_popup(station):
-    """returns a folium popup embeded with a chart based on current water
-    year daily SNOTEL station data
+def get_daily_snotel_data_chart(station):
+    """returns a chart based on current water year daily SNOTEL station data,
+    or None if there is no data
     """
 
     df = get_stations_wy_data(station)
-    if not df.empty:
-        data_label = df.index.name.replace("_", "-")
-        df.rename(
-            columns={"date": "Date"},
-            inplace=True,
+    if df.empty:
+        return None
+    data_label = df.index.name.replace("_", "-")
+    df.rename(
+        columns={"date": "Date"},
+        inplace=True,
+    )
+    scatter = (
+        Chart(df, title="Snow Water Equivalent")
+        .mark_line()
+        .encode(x="Date:T", y=data_label, color="data_type")
+        .interactive()
+    )
+    return scatter
+
+
+def get_monthly_fcst_data_chart(station):
+    """returns a chart based on current water year monthly forecast/observed
+    seasonal streamflow data, or None if there is no data
+    """
+
+    # observed data and forecasts are independent requests, so overlap them
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        df_future = executor.submit(get_stations_wy_data, station)
+        df_forecasts_future = executor.submit(prepare_wy_forecasts, station)
+    df = df_future.result()
+    df_forecasts = df_forecasts_future.result()
+    if df.empty or df_forecasts.empty:
+        return None
+
+    df_forecasts.rename(
+        columns={"date": "Date"},
+        inplace=True,
+    )
+    scatter = (
+        Chart(
+            df_forecasts,
+            title="Forecast Exceedances and Cumulative Seasonal Streamflow to Date",
         )
-        popup = folium.Popup()
-        scatter = (
-            Chart(df, title="Snow Water Equivalent")
-            .mark_line()
-            .encode(x="Date:T", y=data_label, color="data_type")
-            .interactive()
+        .mark_circle(size=60)
+        .encode(
+            x=X("Date:T", axis=Axis(tickCount="month", format="%b %Y")),
+            y="APR-JUL SRVO (kaf):Q",
+            color="Exceedance:N",
+            tooltip=["APR-JUL SRVO (kaf)"],
         )
+        .interactive()
+    )
 
-        vega_lite = folium.VegaLite(
-            scatter,
-            width="100%",
-            height="100%",
+    df.rename(
+        columns={"date": "Date"},
+        inplace=True,
+    )
+    data_label = df.index.name
+    df_obs = df[df["Date"].dt.month.isin([4, 5, 6, 7])].copy()
+    # note forecasts are in kaf and streamflow in ac-ft
+    df_obs["Observed Volume"] = df_obs[data_label].cumsum().to_numpy() / 1000
+    line = (
+        Chart(df_obs)
+        .mark_line()
+        .encode(
+            x=X("Date:T", axis=Axis(tickCount="month", format="%b %Y")),
+            y="Observed Volume",
+            color="data_type",
         )
-        vega_lite.add_to(popup)
-    else:
-        popup = folium.Popup("No data!")
-    return popup
+        .interactive()
+    )
+    return scatter + line
 
 
-def get_monthly_fcst_data_chart_popup(station):
-    """returns a folium popup embeded with a chart based on current water
-    year monthly forecast/observed seasonal streamflow data
+def get_monthly_res_data_chart(station):
+    """returns a chart based on current water year monthly reservoir storage
+    data, or None if there is no data
     """
 
-    popup = folium.Popup()
     df = get_stations_wy_data(station)
-    df_forecasts = prepare_wy_forecasts(station)
-
-    if not df.empty and not df_forecasts.empty:
-        df_forecasts.rename(
-            columns={"date": "Date"},
-            inplace=True,
+    if df.empty:
+        return None
+    df.rename(
+        columns={"date": "Date"},
+        inplace=True,
+    )
+    data_label = df.index.name
+    bar = (
+        Chart(df, title="Observed Data")
+        .mark_bar()
+        .encode(
+            x="data_type",
+            y=data_label,
+            color="data_type",
+            column=Column(
+                "Date:T", timeUnit="yearmonth"
+            ),  # tickCount="month", format="%b %Y")),
         )
-        scatter = (
-            Chart(
-                df_forecasts,
-                title="Forecast Exceedances and Cumulative Seasonal Streamflow to Date",
-            )
-            .mark_circle(size=60)
-            .encode(
-                x=X("Date:T", axis=Axis(tickCount="month", format="%b %Y")),
-                y="APR-JUL SRVO (kaf):Q",
-                color="Exceedance:N",
-                tooltip=["APR-JUL SRVO (kaf)"],
-            )
-            .interactive()
+        .configure_view(
+            stroke=None,
         )
+        .interactive()
+    )
+    return bar
 
-        df.rename(
-            columns={"date": "Date"},
-            inplace=True,
-        )
-        data_label = df.index.name
-        df_obs = df[df["Date"].dt.month.isin([4, 5, 6, 7])].copy()
-        df_obs.loc[:, "Observed Volume"] = df_obs[data_label].cumsum()
-        df_obs.loc[:, "Observed Volume"] = (
-            df_obs["Observed Volume"] / 1000
-        )  # note forecasts are in kaf and streamflow in ac-ft
-        line = (
-            Chart(df_obs)
-            .mark_line()
-            .encode(
-                x=X("Date:T", axis=Axis(tickCount="month", format="%b %Y")),
-                y="Observed Volume",
-                color="data_type",
-            )
-            .interactive()
-        )
 
-        vega_lite_fcst = folium.VegaLite(
-            scatter + line,
-            width="100%",
-            height="100%",
-        )
+# look up dict for which chart to build for each network in our analysis
+chart_builders = {
+    "SNTL": get_daily_snotel_data_chart,
+    "USGS": get_monthly_fcst_data_chart,
+    "BOR": get_monthly_res_data_chart,
+}
 
-        vega_lite_fcst.add_to(popup)
-    else:
-        popup = folium.Popup("No data!")
-    return popup
+
+def get_chart_key(station):
+    """returns a (triplet, elementCode) key for a station's chart, a station
+    may appear once per element so the triplet alone is not unique
+    """
+
+    return (station["stationTriplet"], station["stationElements"][0]["elementCode"])
 
 
-def get_monthly_res_data_chart_popup(station):
-    """returns a folium popup embeded with a chart based on current water
-    year monthly reservoir storage data
+def build_chart_json(station):
+    """returns a stations chart serialized as a Vega-Lite json string, or an
+    empty string if there is no data
     """
 
-    popup = folium.Popup()
-    df = get_stations_wy_data(station)
+    chart = chart_builders[station["networkCode"]](station)
+    if chart is None:
+        return ""
+    return chart.to_json()
 
-    if not df.empty:
-        df.rename(
-            columns={"date": "Date"},
-            inplace=True,
-        )
-        data_label = df.index.name
-        bar = (
-            Chart(df, title="Observed Data")
-            .mark_bar()
-            .encode(
-                x="data_type",
-                y=data_label,
-                color="data_type",
-                column=Column(
-                    "Date:T", timeUnit="yearmonth"
-                ),  # tickCount="month", format="%b %Y")),
-            )
-            .configure_view(
-                stroke=None,
-            )
-            .interactive()
-        )
-        vega_lite_obs = folium.VegaLite(
-            bar,
-            width="100%",
-            height="100%",
-        )
-        vega_lite_obs.add_to(popup)
-    else:
-        popup = folium.Popup("No data!")
+
+def get_chart_popup(chart_json):
+    """returns a folium popup embeded with a Vega-Lite chart json string"""
+
+    if not chart_json:
+        return folium.Popup("No data!")
+    popup = folium.Popup()
+    vega_lite = folium.VegaLite(
+        chart_json,
+        width="100%",
+        height="100%",
+    )
+    vega_lite.add_to(popup)
     return popup
 
 
@@ -365,15 +509,22 @@ network_name_lookup = {i["code"]: i["name"] for i in network_ref_data["networks"
 # create a blank folium map
 map = folium.Map(location=[39.23, -106.90], zoom_start=10)
 
+# fetch and serialize every station's chart concurrently up front, each
+# request is independent so there is no need to wait on them one by one
+with ThreadPoolExecutor(max_workers=8) as executor:
+    chart_json_futures = {
+        get_chart_key(station): executor.submit(build_chart_json, station)
+        for station in all_metadata
+    }
+
+# collect all of the station markers into a single layer, swap in
+# folium.plugins.MarkerCluster() here for analyses with many more stations
+stations_layer = folium.FeatureGroup(name="Stations")
+
 # for each station in our list of stations create a folium marker with embedded chart popup
 for station in all_metadata:
     location = [station["latitude"], station["longitude"]]
-    if station["networkCode"] == "SNTL":
-        popup = get_daily_snotel_data_chart_popup(station)
-    elif station["networkCode"] == "USGS":
-        popup = get_monthly_fcst_data_chart_popup(station)
-    elif station["networkCode"] == "BOR":
-        popup = get_monthly_res_data_chart_popup(station)
+    popup = get_chart_popup(chart_json_futures[get_chart_key(station)].result())
 
     # get the long name from our network look up dict
     network_long_name = network_name_lookup.get(
@@ -383,23 +534,29 @@ for station in all_metadata:
     # create a tooltip for each site based on station name and network
     tooltip = f'{station["name"]} ({network_long_name})'
 
-    # add the marker to the map
-    folium.Marker(
-        location=location,
-        tooltip=tooltip,
-        popup=popup,
-        icon=get_marker_icon(station),
-    ).add_to(map)
+    # add the marker to the stations layer
+    stations_layer.add_child(
+        folium.Marker(
+            location=location,
+            tooltip=tooltip,
+            popup=popup,
+            icon=get_marker_icon(station),
+        )
+    )
+
+# add the stations layer to the map
+map.add_child(stations_layer)
 
 # add a geojson overlay to show the bounds of our analysis basin
 
 # https://gist.github.com/beautah/6fd355f70460a361dc3ad51da49df74c
 basin_geojson_url = "https://gist.githubusercontent.com/beautah/6fd355f70460a361dc3ad51da49df74c/raw/dd75d0ca57c8c1a8208f4cff3a19f50134e1afb2/roaring_fork_huc8.geojson"
-basin_geojson_data = requests.get(basin_geojson_url).json()
-# or a local file is included in the repo
-#
-# with open("./roaring_fork_huc8.geojson", "r") as j:
-#    basin_geojson_data = json.load(j)
+# a local copy is included in the repo and used if the download fails
+basin_geojson_data = get_cached_geojson(
+    basin_geojson_url,
+    CACHE_DIR / "roaring_fork_huc8.geojson",
+    fallback_path="./roaring_fork_huc8.geojson",
+)
 
 # add the geojson to the map
 folium.GeoJson(basin_geojson_data, name="Roraring Fork").add_to(map)